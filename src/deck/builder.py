@@ -7,7 +7,7 @@ import re
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import genanki
 import pandas as pd
@@ -20,6 +20,35 @@ from ..fetchers import AudioFetcher, ImageFetcher
 from ..utils import clean_text_for_display, format_analogues_html, ensure_dir, get_file_size_mb
 from .cache import CacheManager
 
+_SENTENCE_SPLIT_RE = re.compile(r'<br>|\n')
+
+# Media filename templates; bumping _MEDIA_VERSION forces all audio to be regenerated
+_MEDIA_VERSION = "v54"
+_IMAGE_NAME = "_img_{uuid}.jpg"
+_WORD_AUDIO_NAME = "_word_{uuid}_{vid}_" + _MEDIA_VERSION + ".mp3"
+_SENTENCE_AUDIO_NAME = "_sent_{n}_{uuid}_{vid}_" + _MEDIA_VERSION + ".mp3"
+_SENTENCE_VOLUME = "+0%"
+
+
+def _media_filenames(uuid: str, vid: str) -> Tuple[str, str, str, str, str]:
+    """Return (image, word audio, sentence 1-3 audio) filenames for a card."""
+    return (
+        _IMAGE_NAME.format(uuid=uuid),
+        _WORD_AUDIO_NAME.format(uuid=uuid, vid=vid),
+        _SENTENCE_AUDIO_NAME.format(n=1, uuid=uuid, vid=vid),
+        _SENTENCE_AUDIO_NAME.format(n=2, uuid=uuid, vid=vid),
+        _SENTENCE_AUDIO_NAME.format(n=3, uuid=uuid, vid=vid),
+    )
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split context into stripped, non-empty sentences, padded to at least three."""
+    # Vocabulary files separate sentences with <br> only; skip the regex engine for them
+    parts = text.split('<br>') if '\n' not in text else _SENTENCE_SPLIT_RE.split(text)
+    sentences = [s for s in map(str.strip, parts) if s]
+    sentences += [""] * (3 - len(sentences))
+    return sentences
+
 
 class AnkiDeckBuilder:
     """Main class for building Anki decks."""
@@ -32,6 +61,8 @@ class AnkiDeckBuilder:
             language: Language code ('EN', 'DE', etc.)
         """
         self.language = language
+        self._strip_re = re.compile(Config.STRIP_REGEX, re.IGNORECASE)
+        self._media_prefix = os.path.join(Config.MEDIA_DIR, '')  # media dir with trailing separator
         self._ensure_dirs()
         
         self.model = self._create_model()
@@ -152,90 +183,84 @@ class AnkiDeckBuilder:
         if os.path.exists(path):
             self.media_files.append(path)
     
-    async def process_row(self, index: int, row: pd.Series, total: int, pbar) -> None:
-        """Process single vocabulary row."""
+    async def process_row(self, index: int, row: dict, total: int, pbar) -> None:
+        """Process single vocabulary row (all values already strings)."""
         await asyncio.sleep(0.05)  # Small stagger
         
         async with self.semaphore:
             try:
-                raw_word = str(row.get('TargetWord', '')).strip()
+                raw_word = row.get('TargetWord', '').strip()
                 if not raw_word:
                     pbar.update(1)
                     return
                 
-                clean_word = re.sub(Config.STRIP_REGEX, '', raw_word, flags=re.IGNORECASE).strip()
+                clean_word = self._strip_re.sub('', raw_word).strip()
                 
                 # Generate UUID
-                base_hash = hashlib.md5((clean_word + str(row.get('Part_of_Speech', ''))).encode()).hexdigest()
+                base_hash = hashlib.md5((clean_word + row.get('Part_of_Speech', '')).encode()).hexdigest()
                 uuid = f"{base_hash}_{self.language}"
                 
                 self.stats['words_processed'] += 1
                 print(f"[{index+1}/{total}] Processing: {clean_word}...")
                 
                 # Process sentences
-                raw_context = str(row.get('ContextSentences', ''))
-                sentences = [s.strip() for s in re.split(r'<br>|\n', raw_context) if s.strip()]
-                while len(sentences) < 3:
-                    sentences.append("")
+                raw_context = row.get('ContextSentences', '')
+                sentences = _split_sentences(raw_context)
                 
                 # Process translations
-                raw_translation = str(row.get('ContextTranslation', ''))
+                raw_translation = row.get('ContextTranslation', '')
                 clean_trans = clean_text_for_display(raw_translation)
                 
                 # Process analogues
-                raw_analogues = str(row.get('Analogues', ''))
+                raw_analogues = row.get('Analogues', '')
                 clean_analogues = format_analogues_html(raw_analogues)
                 
                 cloze_context = raw_context if raw_context else (sentences[0] if sentences[0] else "")
                 
                 # Generate file names
-                vid = Config.VOICE_ID
-                f_img = f"_img_{uuid}.jpg"
-                f_word = f"_word_{uuid}_{vid}_v54.mp3"
-                f_s1 = f"_sent_1_{uuid}_{vid}_v54.mp3"
-                f_s2 = f"_sent_2_{uuid}_{vid}_v54.mp3"
-                f_s3 = f"_sent_3_{uuid}_{vid}_v54.mp3"
+                f_img, f_word, f_s1, f_s2, f_s3 = _media_filenames(uuid, Config.VOICE_ID)
                 
-                # Check cache and download/generate
-                tasks = []
+                # Check cache and download/generate (only real fetches are scheduled)
+                fetches = {}
                 
                 # Image
-                if self.cache.is_cached(f_img):
-                    tasks.append(asyncio.sleep(0))
-                    has_img = True
-                else:
-                    tasks.append(self.image_fetcher.fetch(str(row.get('ImagePrompt', '')), os.path.join(Config.MEDIA_DIR, f_img)))
-                    has_img = False
+                has_img = self.cache.is_cached(f_img)
+                if not has_img:
+                    fetches['img'] = self.image_fetcher.fetch(row.get('ImagePrompt', ''), self._media_prefix + f_img)
                 
                 # Word audio
-                if self.cache.is_cached(f_word):
-                    tasks.append(asyncio.sleep(0))
-                    has_w = True
-                else:
-                    tasks.append(self.audio_fetcher.fetch(raw_word, os.path.join(Config.MEDIA_DIR, f_word), volume="+40%"))
-                    has_w = False
+                has_w = self.cache.is_cached(f_word)
+                if not has_w:
+                    fetches['word'] = self.audio_fetcher.fetch(raw_word, self._media_prefix + f_word, volume="+40%")
                 
-                # Sentence audio
-                tasks.append(self.audio_fetcher.fetch(sentences[0], os.path.join(Config.MEDIA_DIR, f_s1)) if sentences[0] else asyncio.sleep(0))
-                tasks.append(self.audio_fetcher.fetch(sentences[1], os.path.join(Config.MEDIA_DIR, f_s2)) if sentences[1] else asyncio.sleep(0))
-                tasks.append(self.audio_fetcher.fetch(sentences[2], os.path.join(Config.MEDIA_DIR, f_s3)) if sentences[2] else asyncio.sleep(0))
+                # Sentence audio (fingerprinted by text, voice pool and volume so any change regenerates it)
+                sent_files = [f_s1, f_s2, f_s3]
+                tts_params = f"|{','.join(sorted(self.audio_fetcher.available_voices))}|{_SENTENCE_VOLUME}"
+                sent_fingerprints = [hashlib.md5((s + tts_params).encode()).hexdigest() for s in sentences[:3]]
+                sent_cached = []
+                for sent_idx, (sentence, f_sent, fingerprint) in enumerate(zip(sentences, sent_files, sent_fingerprints)):
+                    sent_cached.append(bool(sentence) and self.cache.is_cached(f_sent, fingerprint=fingerprint))
+                    if sentence and not sent_cached[sent_idx]:
+                        fetches[sent_idx] = self.audio_fetcher.fetch(sentence, self._media_prefix + f_sent, volume=_SENTENCE_VOLUME)
                 
-                results = await asyncio.gather(*tasks)
-                has_img_result, has_w_result, has_s1, has_s2, has_s3 = results
+                results = dict(zip(fetches, await asyncio.gather(*fetches.values())))
                 
-                has_img = has_img or has_img_result
-                has_w = has_w or has_w_result
+                has_img = has_img or results.get('img', False)
+                has_w = has_w or results.get('word', False)
+                has_s1, has_s2, has_s3 = (sent_cached[i] or results.get(i, False) for i in range(3))
                 
-                # Update stats
+                # Update stats (only freshly generated files need a new cache entry)
                 if has_img:
                     self.stats['images_success'] += 1
-                    self.cache.mark_cached(f_img)
+                    if results.get('img'):
+                        self.cache.mark_cached(f_img)
                 else:
                     self.stats['images_failed'] += 1
                 
                 if has_w:
                     self.stats['audio_word_success'] += 1
-                    self.cache.mark_cached(f_word)
+                    if results.get('word'):
+                        self.cache.mark_cached(f_word)
                 else:
                     self.stats['audio_word_failed'] += 1
                 
@@ -243,24 +268,25 @@ class AnkiDeckBuilder:
                 for has_s, sent_idx in [(has_s1, 0), (has_s2, 1), (has_s3, 2)]:
                     if has_s:
                         self.stats['audio_sent_success'] += 1
-                        self.cache.mark_cached([f_s1, f_s2, f_s3][sent_idx])
+                        if results.get(sent_idx):
+                            self.cache.mark_cached(sent_files[sent_idx], fingerprint=sent_fingerprints[sent_idx])
                     elif sent_idx < len(sentences) and sentences[sent_idx]:
                         self.stats['audio_sent_failed'] += 1
                 
                 # Add media files
                 if has_img:
-                    self.media_files.append(os.path.join(Config.MEDIA_DIR, f_img))
+                    self.media_files.append(self._media_prefix + f_img)
                 if has_w:
-                    self.media_files.append(os.path.join(Config.MEDIA_DIR, f_word))
+                    self.media_files.append(self._media_prefix + f_word)
                 if has_s1:
-                    self.media_files.append(os.path.join(Config.MEDIA_DIR, f_s1))
+                    self.media_files.append(self._media_prefix + f_s1)
                 if has_s2:
-                    self.media_files.append(os.path.join(Config.MEDIA_DIR, f_s2))
+                    self.media_files.append(self._media_prefix + f_s2)
                 if has_s3:
-                    self.media_files.append(os.path.join(Config.MEDIA_DIR, f_s3))
+                    self.media_files.append(self._media_prefix + f_s3)
                 
                 # Determine gender
-                gender = "en" if self.language == "EN" else str(row.get('Gender', '')).strip().lower()
+                gender = "en" if self.language == "EN" else row.get('Gender', '').strip().lower()
                 if not gender or gender == "nan":
                     gender = "none"
                 
@@ -270,20 +296,20 @@ class AnkiDeckBuilder:
                 note = genanki.Note(
                     model=self.model,
                     fields=[
-                        str(row.get('TargetWord', '')),
-                        str(row.get('Meaning', '')),
-                        str(row.get('IPA', '')),
-                        str(row.get('Part_of_Speech', '')),
+                        row.get('TargetWord', ''),
+                        row.get('Meaning', ''),
+                        row.get('IPA', ''),
+                        row.get('Part_of_Speech', ''),
                         gender,
-                        str(row.get('Morphology', '')),
-                        str(row.get('Nuance', '')),
+                        row.get('Morphology', ''),
+                        row.get('Nuance', ''),
                         sentences[0], sentences[1], sentences[2],
                         clean_trans,
-                        str(row.get('Etymology', '')),
-                        str(row.get('Mnemonic', '')),
+                        row.get('Etymology', ''),
+                        row.get('Mnemonic', ''),
                         clean_analogues,
                         f'<img src="{f_img}">' if has_img else "",
-                        str(row.get('Tags', '')),
+                        row.get('Tags', ''),
                         f"[sound:{f_word}]" if has_w else "",
                         f_s1 if has_s1 else "",
                         f_s2 if has_s2 else "",
@@ -292,7 +318,7 @@ class AnkiDeckBuilder:
                         cloze_context,
                         uuid
                     ],
-                    tags=str(row.get('Tags', '')).split(),
+                    tags=row.get('Tags', '').split(),
                     guid=uuid
                 )
                 
@@ -319,7 +345,7 @@ class AnkiDeckBuilder:
             print(f"Voice: {Config.VOICE}")
             print(f"Language: {self.language}")
             
-            df = pd.read_csv(csv_file, sep='|', encoding='utf-8-sig').fillna('')
+            df = pd.read_csv(csv_file, sep='|', encoding='utf-8-sig').fillna('').astype(str)
             print(f"Shuffling {len(df)} words...")
             df = df.sample(frac=1).reset_index(drop=True)
             df.columns = df.columns.str.strip()
@@ -333,8 +359,12 @@ class AnkiDeckBuilder:
         print(f"Processing {len(df)} words...\n")
         
         with atqdm(total=len(df), desc="Building deck", unit="word") as pbar:
-            tasks = [self.process_row(i, row, len(df), pbar) for i, row in df.iterrows()]
-            await asyncio.gather(*tasks)
+            rows = df.to_dict('records')
+            tasks = [self.process_row(i, row, len(rows), pbar) for i, row in enumerate(rows)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                self.cache.flush()
         
         return True
     
@@ -348,10 +378,15 @@ class AnkiDeckBuilder:
         if output_file is None:
             output_file = os.path.join(Config.OUTPUT_DIR, f"ankitect_{self.language.lower()}.apkg")
         
-        valid_media = list(set([f for f in self.media_files if os.path.exists(f)]))
-        
-        # Calculate total size
-        total_size = sum(os.path.getsize(f) for f in valid_media if os.path.exists(f))
+        # Keep existing files and total their size with one stat each
+        valid_media = []
+        total_size = 0
+        for f in dict.fromkeys(self.media_files):
+            try:
+                total_size += os.path.getsize(f)
+            except OSError:
+                continue
+            valid_media.append(f)
         self.stats['total_bytes'] = total_size
         
         # Backup old file
@@ -10,20 +10,28 @@ from ..config import Config
 
 
 class CacheManager:
-    """Manage build cache for already processed files."""
+    """
+    Manage build cache for already processed files.
     
-    def __init__(self, cache_file: Optional[str] = None):
+    Entries are updated in memory and written out every `autosave_every`
+    changes; call flush() to persist the remainder.
+    """
+    
+    def __init__(self, cache_file: Optional[str] = None, autosave_every: int = 50):
         """
         Initialize cache manager.
         
         Args:
             cache_file: Path to cache JSON file (defaults to data/cache/build_cache.json)
+            autosave_every: Number of unsaved changes that triggers a save
         """
         if cache_file is None:
             cache_file = os.path.join(Config.CACHE_DIR, "build_cache.json")
         
         self.cache_file = cache_file
         self.cache: Dict = self._load_cache()
+        self.autosave_every = autosave_every
+        self._unsaved_changes = 0
     
     def _load_cache(self) -> Dict:
         """Load cache from file."""
@@ -39,39 +47,69 @@ class CacheManager:
         """Save cache to file."""
         try:
             Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            # Serialize up front so the file is written with a single call
+            data = json.dumps(self.cache, indent=2)
             with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2)
+                f.write(data)
+            self._unsaved_changes = 0
         except Exception:
             pass
     
-    def is_cached(self, filename: str, min_size: int = 500) -> bool:
+    def flush(self) -> None:
+        """Save cache to file if it has unsaved changes."""
+        if self._unsaved_changes:
+            self.save()
+    
+    def _record_change(self) -> None:
+        """Count an in-memory change and autosave once enough have piled up."""
+        self._unsaved_changes += 1
+        if self._unsaved_changes >= self.autosave_every:
+            self.save()
+    
+    def _media_file_size(self, filename: str) -> int:
+        """Get size of a media file, or 0 if it is missing."""
+        try:
+            return os.stat(os.path.join(Config.MEDIA_DIR, filename)).st_size
+        except OSError:
+            return 0
+    
+    def is_cached(self, filename: str, min_size: int = 500, fingerprint: Optional[str] = None) -> bool:
         """
         Check if file is in cache and exists on disk.
         
         Args:
             filename: Filename to check
             min_size: Minimum file size in bytes
+            fingerprint: Source fingerprint the cached file must have been made from
             
         Returns:
             True if file is cached and valid, False otherwise
         """
-        if filename not in self.cache:
+        entry = self.cache.get(filename)
+        if entry is None:
+            return False
+        
+        # Source changed since the file was generated
+        if fingerprint is not None and not (isinstance(entry, dict) and entry.get('fingerprint') == fingerprint):
             return False
         
         # Check if file still exists
-        file_path = os.path.join(Config.MEDIA_DIR, filename)
-        if os.path.exists(file_path) and os.path.getsize(file_path) > min_size:
+        if self._media_file_size(filename) > min_size:
             return True
         
         # Clean up stale cache entry
         del self.cache[filename]
-        self.save()
+        self._record_change()
         return False
     
-    def mark_cached(self, filename: str) -> None:
-        """Mark file as cached."""
-        self.cache[filename] = datetime.now().isoformat()
-        self.save()
+    def mark_cached(self, filename: str, fingerprint: Optional[str] = None) -> None:
+        """Mark file as cached, optionally recording the source fingerprint."""
+        timestamp = datetime.now().isoformat()
+        if fingerprint is None:
+            self.cache[filename] = timestamp
+        else:
+            self.cache[filename] = {'cached_at': timestamp, 'fingerprint': fingerprint}
+        self._record_change()
     
     def clear(self) -> None:
         """Clear all cache."""
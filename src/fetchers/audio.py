@@ -12,6 +12,11 @@ import edge_tts
 from ..config import Config
 from .base import BaseFetcher
 
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Whitespace runs, each optionally swallowing a following list number ("1." / "2)"),
+# plus a list number at the very start; every match collapses to a single space
+_NUMBERING_OR_SPACE_RE = re.compile(r'^\d+[\.\)]\s*|\s+(?:\d+[\.\)]\s*)?')
+
 
 class AudioFetcher(BaseFetcher):
     """Handle audio generation via TTS (Edge TTS)."""
@@ -33,14 +38,11 @@ class AudioFetcher(BaseFetcher):
         # Unescape HTML entities
         text = html.unescape(str(text))
         
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove numbered lists
-        text = re.sub(r'(^|\s)\d+[\.\)]\s*', ' ', text)
+        # Remove HTML tags (first, so numbers right after a tag are seen as list items)
+        text = _HTML_TAG_RE.sub('', text)
         
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Remove numbered lists and normalize whitespace in one pass
+        text = _NUMBERING_OR_SPACE_RE.sub(' ', text).strip()
         
         return text
     
@@ -1,8 +1,32 @@
 """Utility functions."""
 
+import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
+
+_NUMBERED_PREFIX_RE = re.compile(r'^\s*\d+[\.\)]\s*')
+_ANALOGUE_LINE_SPLIT_RE = re.compile(r'\n|<br\s*/?>')
+
+
+def _iter_lines_with_breaks(text: str) -> Iterator[Tuple[str, str]]:
+    """Yield (line, break) pairs; break is '<br>', '\\n', or '' after the last line."""
+    pos = 0
+    br = text.find('<br>')
+    nl = text.find('\n')
+    
+    # Each delimiter is searched for again only after it has been consumed
+    while br >= 0 or nl >= 0:
+        if nl < 0 or 0 <= br < nl:
+            yield text[pos:br], '<br>'
+            pos = br + 4
+            br = text.find('<br>', pos)
+        else:
+            yield text[pos:nl], '\n'
+            pos = nl + 1
+            nl = text.find('\n', pos)
+    
+    yield text[pos:], ''
 
 
 def clean_text_for_display(text: str) -> str:
@@ -10,25 +34,27 @@ def clean_text_for_display(text: str) -> str:
     if not text:
         return ""
     
-    lines = re.split(r'(<br>|\n)', str(text))
     cleaned_lines = []
     
-    for line in lines:
-        if line in ['<br>', '\n']:
-            cleaned_lines.append(line)
-        else:
-            cleaned_lines.append(re.sub(r'^\s*\d+[\.\)]\s*', '', line))
+    for line, line_break in _iter_lines_with_breaks(str(text)):
+        cleaned_lines.append(_NUMBERED_PREFIX_RE.sub('', line))
+        cleaned_lines.append(line_break)
     
     return "".join(cleaned_lines)
 
 
 def format_analogues_html(text: str) -> str:
     """Format analogues table from text."""
-    if not text or str(text).lower() == 'nan':
+    if not text:
+        return ""
+    
+    # Only a three-character value can spell 'nan' (float NaN included)
+    text = str(text)
+    if len(text) == 3 and text.lower() == 'nan':
         return ""
     
-    lines = re.split(r'\n|<br\s*/?>', str(text))
-    html_out = '<table class="analogues-table">'
+    lines = _ANALOGUE_LINE_SPLIT_RE.split(text)
+    rows = ['<table class="analogues-table">']
     
     for line in lines:
         line = line.strip()
@@ -39,12 +65,12 @@ def format_analogues_html(text: str) -> str:
         if len(parts) == 2:
             code = parts[0].strip()
             word = parts[1].strip()
-            html_out += f'<tr class="ana-row"><td class="ana-lang">{code}</td><td class="ana-word">{word}</td></tr>'
+            rows.append(f'<tr class="ana-row"><td class="ana-lang">{code}</td><td class="ana-word">{word}</td></tr>')
         else:
-            html_out += f'<tr class="ana-row"><td colspan="2" class="ana-word">{line}</td></tr>'
+            rows.append(f'<tr class="ana-row"><td colspan="2" class="ana-word">{line}</td></tr>')
     
-    html_out += '</table>'
-    return html_out
+    rows.append('</table>')
+    return "".join(rows)
 
 
 def ensure_dir(path: str) -> None:
@@ -54,6 +80,7 @@ def ensure_dir(path: str) -> None:
 
 def get_file_size_mb(path: str) -> float:
     """Get file size in megabytes."""
-    if not Path(path).exists():
+    try:
+        return os.stat(path).st_size / (1024 * 1024)
+    except OSError:
         return 0.0
-    return Path(path).stat().st_size / (1024 * 1024)